@@ -14,17 +14,25 @@ normalize styles.
 from __future__ import annotations
 
 import argparse
-import difflib
 import re
+import shutil
 import sys
 import zipfile
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from lxml import etree
 
+try:
+    # Optional C++ accelerator for token diffs; _lcs_opcodes is used when absent.
+    from rapidfuzz.distance import Indel
+except ImportError:  # pragma: no cover
+    Indel = None
+
 
 W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
 XML_NS = "http://www.w3.org/XML/1998/namespace"
@@ -35,15 +43,45 @@ def w_tag(local: str) -> str:
     return f"{{{W_NS}}}{local}"
 
 
+# Compiled once; calling p.xpath("...") re-parses the expression every time.
+_XP_RUN_TEXT_NODES = etree.XPath("./w:r/w:t|./w:r/w:tab|./w:r/w:br", namespaces=NS)
+_XP_DESC_RUNS = etree.XPath(".//w:r", namespaces=NS)
+_XP_DESC_RUN_TEXT_NODES = etree.XPath(".//w:r/w:t|.//w:r/w:tab|.//w:r/w:br", namespaces=NS)
+_XP_DESC_RUNS_WITH_T = etree.XPath(".//w:r[w:t]", namespaces=NS)
+_XP_BODY_PARAS = etree.XPath("/w:document/w:body//w:p", namespaces=NS)
+_XP_HYPERLINK_FIELD = etree.XPath(".//w:hyperlink|.//w:fldChar|.//w:instrText", namespaces=NS)
+
+# Qualified tag names, built once rather than per element comparison.
+_T_P = w_tag("p")
+_T_PPR = w_tag("pPr")
+_T_R = w_tag("r")
+_T_RPR = w_tag("rPr")
+_T_T = w_tag("t")
+_T_TAB = w_tag("tab")
+_T_BR = w_tag("br")
+_T_FN = w_tag("footnoteReference")
+_T_EN = w_tag("endnoteReference")
+_T_B = w_tag("b")
+_T_HIGHLIGHT = w_tag("highlight")
+_T_VAL = w_tag("val")
+
+
+_WS = (" ", "\t", "\n")
+_XML_SPACE = f"{{{XML_NS}}}space"
+
+
 def _t(text: str) -> etree._Element:
-    el = etree.Element(w_tag("t"))
-    if text.startswith((" ", "\t", "\n")) or text.endswith((" ", "\t", "\n")):
-        el.set(f"{{{XML_NS}}}space", "preserve")
+    el = etree.Element(_T_T)
+    if text.startswith(_WS) or text.endswith(_WS):
+        # Setting the attribute after creation is cheaper in lxml than passing
+        # an attrib dict to Element().
+        el.set(_XML_SPACE, "preserve")
     el.text = text
     return el
 
 
 TOKEN_RE = re.compile(r"\s+|[^\s]+", re.UNICODE)
+_TAB_NL_SPLIT = re.compile(r"([\t\n])")
 
 
 def _tokenize(s: str) -> List[str]:
@@ -52,94 +90,214 @@ def _tokenize(s: str) -> List[str]:
     return TOKEN_RE.findall(s)
 
 
-def _set_bold_and_highlight_yellow(rPr: etree._Element) -> None:
-    b = rPr.find("w:b", namespaces=NS)
-    if b is None:
-        b = etree.Element(w_tag("b"))
-        rPr.append(b)
-    else:
-        b.set(w_tag("val"), "1")
+def _is_token_boundary(s: str, k: int) -> bool:
+    return k == 0 or k == len(s) or s[k - 1].isspace() != s[k].isspace()
 
-    highlight = rPr.find("w:highlight", namespaces=NS)
-    if highlight is None:
-        highlight = etree.Element(w_tag("highlight"))
-        rPr.append(highlight)
-    highlight.set(w_tag("val"), "yellow")
+
+def _common_token_affixes(a: str, b: str) -> Tuple[int, int]:
+    # Char lengths of the shared prefix/suffix of a and b, backed off to token
+    # boundaries so only the differing middle needs tokenizing and diffing.
+    n = min(len(a), len(b))
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.startswith(b[:mid]):
+            lo = mid
+        else:
+            hi = mid - 1
+    pre = lo
+    if not (_is_token_boundary(a, pre) and _is_token_boundary(b, pre)):
+        space = a[pre - 1].isspace()
+        while pre > 0 and a[pre - 1].isspace() == space:
+            pre -= 1
+
+    lo, hi = 0, n - pre
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.endswith(b[len(b) - mid :]):
+            lo = mid
+        else:
+            hi = mid - 1
+    suf = lo
+    if not (_is_token_boundary(a, len(a) - suf) and _is_token_boundary(b, len(b) - suf)):
+        space = a[len(a) - suf].isspace()
+        while suf > 0 and a[len(a) - suf].isspace() == space:
+            suf -= 1
+    return pre, suf
+
+
+# int.bit_count() is Python 3.10+; bin().count() gives the same result earlier.
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+
+def _lcs_opcodes(a: List[str], b: List[str]) -> List[Tuple[str, int, int, int, int]]:
+    # Bit-parallel LCS (Allison-Dix / Hyyro) using Python ints as bit vectors:
+    # bit j of row i is 0 where LCS(a[:i], b[:j + 1]) gains a token, so each
+    # row of the DP table costs a few C-level big-int operations.
+    n, m = len(a), len(b)
+    masks: Dict[str, int] = {}
+    for j, tok in enumerate(b):
+        masks[tok] = masks.get(tok, 0) | (1 << j)
+    full = (1 << m) - 1
+    rows = [full]
+    v = full
+    for tok in a:
+        u = v & masks.get(tok, 0)
+        v = ((v + u) | (v - u)) & full
+        rows.append(v)
+
+    def lcs_len(i: int, j: int) -> int:
+        return j - _popcount(rows[i] & ((1 << j) - 1))
+
+    # Trace one optimal alignment back from (n, m).
+    matched: List[Tuple[int, int]] = []
+    i, j = n, m
+    cur = lcs_len(n, m)
+    while i > 0 and j > 0:
+        if (rows[i] >> (j - 1)) & 1:
+            j -= 1
+        elif lcs_len(i - 1, j) == cur:
+            i -= 1
+        else:
+            # LCS(i, j) exceeds both neighbours, so a[i - 1] == b[j - 1].
+            i -= 1
+            j -= 1
+            cur -= 1
+            matched.append((i, j))
+
+    # Same grouping as difflib.SequenceMatcher.get_opcodes().
+    blocks: List[List[int]] = []
+    for ai, bj in reversed(matched):
+        if blocks and blocks[-1][0] + blocks[-1][2] == ai and blocks[-1][1] + blocks[-1][2] == bj:
+            blocks[-1][2] += 1
+        else:
+            blocks.append([ai, bj, 1])
+    blocks.append([n, m, 0])
+
+    opcodes: List[Tuple[str, int, int, int, int]] = []
+    i = j = 0
+    for ai, bj, size in blocks:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, j))
+        elif j < bj:
+            opcodes.append(("insert", i, i, j, bj))
+        if size:
+            opcodes.append(("equal", ai, ai + size, bj, bj + size))
+        i, j = ai + size, bj + size
+    return opcodes
+
+
+def _token_opcodes(a: List[str], b: List[str]) -> List[Tuple[str, int, int, int, int]]:
+    # (tag, i1, i2, j1, j2) tuples as in difflib. Both paths compute a
+    # longest common subsequence of whole tokens; nothing is treated as junk.
+    if Indel is not None:
+        return Indel.opcodes(a, b).as_list()
+    return _lcs_opcodes(a, b)
 
 
 def _run_rPr(run: etree._Element) -> Optional[etree._Element]:
-    return run.find("w:rPr", namespaces=NS)
+    # CT_R only allows rPr as the first child, so skip a find() over the run.
+    if len(run) and run[0].tag == _T_RPR:
+        return run[0]
+    return None
 
 
 def _clone_run_with_rPr(src_run: Optional[etree._Element]) -> etree._Element:
-    r = etree.Element(w_tag("r"))
+    r = etree.Element(_T_R)
     if src_run is not None:
-        for k, v in src_run.attrib.items():
-            r.set(k, v)
+        r.attrib.update(src_run.attrib)
         rPr = _run_rPr(src_run)
         if rPr is not None:
-            r.append(deepcopy(rPr))
+            # lxml's __copy__ is already a deep subtree copy; calling it directly
+            # skips copy.deepcopy's generic dispatch and memo bookkeeping.
+            r.append(rPr.__copy__())
     return r
 
 
-def _clone_run_for_changed_text(context_run: Optional[etree._Element], *, markup: bool) -> etree._Element:
-    r = _clone_run_with_rPr(context_run)
+def _build_markup_rPr(context_run: Optional[etree._Element]) -> etree._Element:
+    # The context run's formatting, plus bold and a yellow highlight.
+    src = _run_rPr(context_run) if context_run is not None else None
+    rPr = src.__copy__() if src is not None else etree.Element(_T_RPR)
+
+    b = rPr.find(_T_B)
+    if b is None:
+        b = etree.SubElement(rPr, _T_B)
+    else:
+        b.set(_T_VAL, "1")
+
+    highlight = rPr.find(_T_HIGHLIGHT)
+    if highlight is None:
+        highlight = etree.SubElement(rPr, _T_HIGHLIGHT)
+    highlight.set(_T_VAL, "yellow")
+    return rPr
+
+
+def _changed_run_template(context_run: Optional[etree._Element], *, markup: bool) -> etree._Element:
+    # Every run emitted for one stretch of changed text has the same attributes
+    # and rPr, so build that shell once and copy it per run.
     if not markup:
-        return r
-    rPr = r.find("w:rPr", namespaces=NS)
-    if rPr is None:
-        rPr = etree.Element(w_tag("rPr"))
-        r.insert(0, rPr)
-    _set_bold_and_highlight_yellow(rPr)
+        return _clone_run_with_rPr(context_run)
+    r = etree.Element(_T_R)
+    if context_run is not None:
+        r.attrib.update(context_run.attrib)
+    r.append(_build_markup_rPr(context_run))
     return r
 
 
 def _paragraph_text(p: etree._Element) -> str:
     # Include tabs and line breaks so paragraph structure isn't silently changed.
+    # Same text as _paragraph_atoms, without building the atoms.
     parts: List[str] = []
-    for r in p.xpath("./w:r", namespaces=NS):
-        for child in r:
-            if child.tag == w_tag("t"):
-                parts.append(child.text or "")
-            elif child.tag == w_tag("tab"):
-                parts.append("\t")
-            elif child.tag == w_tag("br"):
-                parts.append("\n")
+    for child in _XP_RUN_TEXT_NODES(p):
+        tag = child.tag
+        if tag == _T_T:
+            parts.append(child.text or "")
+        elif tag == _T_TAB:
+            parts.append("\t")
+        else:
+            parts.append("\n")
     return "".join(parts)
 
 
 def _paragraph_text_all_runs(p: etree._Element) -> str:
     # Include text from nested runs (e.g., inside hyperlinks) in document order.
+    # Text-box paragraphs nested in p are listed as paragraphs of their own,
+    # so their runs are left out here.
+    nested = next(p.iterdescendants(_T_P), None) is not None
     parts: List[str] = []
-    for r in p.xpath(".//w:r", namespaces=NS):
-        for child in r:
-            if child.tag == w_tag("t"):
-                parts.append(child.text or "")
-            elif child.tag == w_tag("tab"):
-                parts.append("\t")
-            elif child.tag == w_tag("br"):
-                parts.append("\n")
+    for child in _XP_DESC_RUN_TEXT_NODES(p):
+        if nested and next(child.iterancestors(_T_P)) is not p:
+            continue
+        tag = child.tag
+        if tag == _T_T:
+            parts.append(child.text or "")
+        elif tag == _T_TAB:
+            parts.append("\t")
+        else:
+            parts.append("\n")
     return "".join(parts)
 
 
 def _paragraph_is_simple(p: etree._Element) -> bool:
     # We only rewrite paragraphs that are "run-only" with pPr first.
     children = list(p)
-    pPr = p.find("w:pPr", namespaces=NS)
+    pPr = p.find(_T_PPR)
     if pPr is not None and children and children[0] is not pPr:
         # Avoid reordering odd/rare paragraphs where pPr isn't first.
         return False
     # Skip hyperlinks/fields; rewriting them safely needs more logic.
-    if p.xpath(".//w:hyperlink|.//w:fldChar|.//w:instrText", namespaces=NS):
+    if _XP_HYPERLINK_FIELD(p):
         return False
     return True
 
 
 def _first_textual_run_in_paragraph(p: etree._Element) -> Optional[etree._Element]:
-    runs = p.xpath(".//w:r[w:t]", namespaces=NS)
+    runs = _XP_DESC_RUNS_WITH_T(p)
     if runs:
         return runs[0]
-    runs = p.xpath(".//w:r", namespaces=NS)
+    runs = _XP_DESC_RUNS(p)
     return runs[0] if runs else None
 
 
@@ -167,32 +325,32 @@ def _paragraph_atoms(p: etree._Element) -> Tuple[List[Atom], str]:
     atoms: List[Atom] = []
     pos = 0
     for child in p:
-        if child.tag == w_tag("pPr"):
+        if child.tag == _T_PPR:
             continue
-        if child.tag != w_tag("r"):
+        if child.tag != _T_R:
             atoms.append(Atom("p_special", pos, pos, None, child))
             continue
 
         run = child
         for rc in run:
-            if rc.tag == w_tag("rPr"):
+            if rc.tag == _T_RPR:
                 continue
-            if rc.tag == w_tag("t"):
+            if rc.tag == _T_T:
                 txt = rc.text or ""
                 if txt:
                     atoms.append(Atom("text", pos, pos + len(txt), run, rc, txt))
                     pos += len(txt)
                 else:
                     atoms.append(Atom("text", pos, pos, run, rc, ""))
-            elif rc.tag == w_tag("tab"):
+            elif rc.tag == _T_TAB:
                 atoms.append(Atom("tab", pos, pos + 1, run, rc, "\t"))
                 pos += 1
-            elif rc.tag == w_tag("br"):
+            elif rc.tag == _T_BR:
                 atoms.append(Atom("br", pos, pos + 1, run, rc, "\n"))
                 pos += 1
-            elif rc.tag == w_tag("footnoteReference"):
+            elif rc.tag == _T_FN:
                 atoms.append(Atom("fn", pos, pos, run, rc))
-            elif rc.tag == w_tag("endnoteReference"):
+            elif rc.tag == _T_EN:
                 atoms.append(Atom("endnote", pos, pos, run, rc))
             else:
                 atoms.append(Atom("run_special", pos, pos, run, rc))
@@ -200,82 +358,102 @@ def _paragraph_atoms(p: etree._Element) -> Tuple[List[Atom], str]:
     return atoms, old_text
 
 
-def _context_run_for_pos(atoms: List[Atom], pos: int) -> Optional[etree._Element]:
+@dataclass(frozen=True)
+class AtomIndex:
+    # Textual (text/tab/br) atoms in document order. Their starts and ends are
+    # both non-decreasing, so positions can be located by bisection.
+    text_atoms: List[Atom]
+    starts: List[int]
+    ends: List[int]
+    last_run: Optional[etree._Element]
+
+
+def _index_atoms(atoms: List[Atom]) -> AtomIndex:
+    text_atoms = [a for a in atoms if a.run is not None and a.kind in ("text", "tab", "br")]
+    last_run = next((a.run for a in reversed(atoms) if a.run is not None), None)
+    return AtomIndex(
+        text_atoms,
+        [a.start for a in text_atoms],
+        [a.end for a in text_atoms],
+        last_run,
+    )
+
+
+def _context_run_for_pos(index: AtomIndex, pos: int) -> Optional[etree._Element]:
     # Prefer body-text runs so inserted text does not inherit footnote/endnote
     # superscript styling when edits occur adjacent to references.
-    for a in atoms:
-        if a.run is not None and a.kind in ("text", "tab", "br") and a.start <= pos < a.end:
-            return a.run
-        if a.run is not None and a.kind == "text" and a.start == pos and a.end == pos:
-            return a.run
+    text_atoms = index.text_atoms
+    if not text_atoms:
+        # Last resort for non-text-only paragraphs.
+        return index.last_run
+
+    # Direct hit: the atom spanning pos, else the first atom starting at pos
+    # (which spans it or is an empty w:t anchored there).
+    lo = bisect_left(index.starts, pos)
+    if lo > 0 and text_atoms[lo - 1].end > pos:
+        return text_atoms[lo - 1].run
+    if lo < len(text_atoms) and text_atoms[lo].start == pos:
+        return text_atoms[lo].run
 
     # If no direct hit, prefer the nearest textual run behind the insertion
     # point, then the nearest textual run ahead.
-    for a in reversed(atoms):
-        if a.run is not None and a.kind in ("text", "tab", "br") and a.end <= pos:
-            return a.run
-    for a in atoms:
-        if a.run is not None and a.kind in ("text", "tab", "br") and a.start >= pos:
-            return a.run
-
-    # Last resort for non-text-only paragraphs.
-    for a in reversed(atoms):
-        if a.run is not None:
-            return a.run
-    return None
+    behind = bisect_right(index.ends, pos) - 1
+    if behind >= 0:
+        return text_atoms[behind].run
+    return text_atoms[lo].run
 
 
 def _emit_atom(atom: Atom, *, text_override: Optional[str] = None) -> etree._Element:
+    # Non-text elements are emitted at most once per rewrite, so the original
+    # element is moved into the output instead of being copied.
     if atom.kind == "p_special":
-        return deepcopy(atom.elem)
+        return atom.elem
 
     run = _clone_run_with_rPr(atom.run)
     if atom.kind == "text":
         run.append(_t(text_override if text_override is not None else atom.text))
-    elif atom.kind == "tab":
-        run.append(deepcopy(atom.elem))
-    elif atom.kind == "br":
-        run.append(deepcopy(atom.elem))
     else:
-        run.append(deepcopy(atom.elem))
+        run.append(atom.elem)
     return run
 
 
-def _emit_changed_text(text: str, context_run: Optional[etree._Element], *, markup: bool) -> List[etree._Element]:
+def _emit_changed_text(
+    text: str,
+    context_run: Optional[etree._Element],
+    *,
+    markup: bool,
+    templates: Optional[Dict[int, etree._Element]] = None,
+) -> List[etree._Element]:
     out: List[etree._Element] = []
     if not text:
         return out
 
+    # Callers rewriting one paragraph pass a shared dict so each context run's
+    # template is built once, however many edits fall inside it.
+    if templates is None:
+        template = _changed_run_template(context_run, markup=markup)
+    else:
+        template = templates.get(id(context_run))
+        if template is None:
+            template = templates[id(context_run)] = _changed_run_template(context_run, markup=markup)
+
     # Preserve tabs/line breaks as Word elements, not literal characters.
-    i = 0
-    while i < len(text):
-        ch = text[i]
-        if ch == "\t":
-            r = _clone_run_for_changed_text(context_run, markup=markup)
-            r.append(etree.Element(w_tag("tab")))
-            out.append(r)
-            i += 1
-            continue
-        if ch == "\n":
-            r = _clone_run_for_changed_text(context_run, markup=markup)
-            r.append(etree.Element(w_tag("br")))
-            out.append(r)
-            i += 1
+    for part in _TAB_NL_SPLIT.split(text):
+        if not part:
             continue
-
-        j = i
-        while j < len(text) and text[j] not in ("\t", "\n"):
-            j += 1
-        chunk = text[i:j]
-        r = _clone_run_for_changed_text(context_run, markup=markup)
-        r.append(_t(chunk))
+        r = template.__copy__()
+        if part == "\t":
+            r.append(etree.Element(_T_TAB))
+        elif part == "\n":
+            r.append(etree.Element(_T_BR))
+        else:
+            r.append(_t(part))
         out.append(r)
-        i = j
     return out
 
 
 def _rewrite_paragraph_in_place(p: etree._Element, new_children: List[etree._Element]) -> None:
-    pPr = p.find("w:pPr", namespaces=NS)
+    pPr = p.find(_T_PPR)
     for child in list(p):
         if child is pPr:
             continue
@@ -291,50 +469,56 @@ def _rewrite_paragraph_in_place(p: etree._Element, new_children: List[etree._Ele
 
 
 def _apply_diff_to_paragraph(p: etree._Element, new_text: str, *, markup: bool) -> bool:
-    atoms, old_text = _paragraph_atoms(p)
-    if old_text == new_text:
+    # Most paragraphs are unchanged; compare plain text before building atoms.
+    if _paragraph_text(p) == new_text:
         return False
+    atoms, old_text = _paragraph_atoms(p)
+    atom_index = _index_atoms(atoms)
+
+    # Only the middle between the unchanged prefix/suffix is tokenized and diffed.
+    pre, suf = _common_token_affixes(old_text, new_text)
+    old_end = len(old_text) - suf
+    old_tokens = _tokenize(old_text[pre:old_end])
+    new_tokens = _tokenize(new_text[pre : len(new_text) - suf])
+
+    opcodes = _token_opcodes(old_tokens, new_tokens)
 
-    old_tokens = _tokenize(old_text)
-    new_tokens = _tokenize(new_text)
-
-    sm = difflib.SequenceMatcher(a=old_tokens, b=new_tokens, autojunk=False)
-    opcodes = sm.get_opcodes()
-
-    # Precompute token -> char offsets.
-    old_tok_starts: List[int] = []
-    cur = 0
-    for tok in old_tokens:
-        old_tok_starts.append(cur)
-        cur += len(tok)
-    old_total = cur
-
-    new_tok_starts: List[int] = []
-    cur = 0
-    for tok in new_tokens:
-        new_tok_starts.append(cur)
-        cur += len(tok)
-
-    def old_char_range(i1: int, i2: int) -> Tuple[int, int]:
-        if i1 == i2:
-            return (old_tok_starts[i1] if i1 < len(old_tok_starts) else old_total, old_tok_starts[i1] if i1 < len(old_tok_starts) else old_total)
-        start = old_tok_starts[i1]
-        end = old_tok_starts[i2 - 1] + len(old_tokens[i2 - 1])
-        return start, end
-
-    def new_char_range(j1: int, j2: int) -> Tuple[int, int]:
-        if j1 == j2:
-            at = new_tok_starts[j1] if j1 < len(new_tok_starts) else len(new_text)
-            return at, at
-        start = new_tok_starts[j1]
-        end = new_tok_starts[j2 - 1] + len(new_tokens[j2 - 1])
-        return start, end
+    # Precompute token -> char offsets; the trailing sentinel is the end of the
+    # middle, so token range [i1, i2) maps to chars [starts[i1], starts[i2]).
+    old_tok_starts = list(accumulate((len(tok) for tok in old_tokens), initial=pre))
+    new_tok_starts = list(accumulate((len(tok) for tok in new_tokens), initial=pre))
 
     emitted_specials: set[int] = set()
+    moved_runs: set[int] = set()
+
+    # Atoms of one run are contiguous; remember where each run's atoms end.
+    run_atoms_end = {id(a.run): i + 1 for i, a in enumerate(atoms) if a.run is not None}
+
+    def whole_run_in_segment(run_atoms: List[Atom], start: int, end: int) -> bool:
+        for a in run_atoms:
+            if a.kind in ("text", "tab", "br"):
+                if a.start < start or a.end > end:
+                    return False
+            elif not start <= a.start <= end or id(a.elem) in emitted_specials:
+                return False
+        return True
 
     def emit_old_segment(start: int, end: int, *, include_text: bool) -> List[etree._Element]:
         out: List[etree._Element] = []
-        for a in atoms:
+        i = 0
+        while i < len(atoms):
+            a = atoms[i]
+            if include_text and a.run is not None and (i == 0 or atoms[i - 1].run is not a.run):
+                j = run_atoms_end[id(a.run)]
+                run_atoms = atoms[i:j]
+                if id(a.run) not in moved_runs and whole_run_in_segment(run_atoms, start, end):
+                    # Unchanged whole run: move the original element as-is.
+                    moved_runs.add(id(a.run))
+                    emitted_specials.update(id(b.elem) for b in run_atoms if b.kind not in ("text", "tab", "br"))
+                    out.append(a.run)
+                    i = j
+                    continue
+            i += 1
             if a.kind == "text":
                 if not include_text:
                     continue
@@ -358,31 +542,38 @@ def _apply_diff_to_paragraph(p: etree._Element, new_text: str, *, markup: bool)
                     out.append(_emit_atom(a))
         return out
 
+    templates: Dict[int, etree._Element] = {}
     new_children: List[etree._Element] = []
+    if pre:
+        new_children.extend(emit_old_segment(0, pre, include_text=True))
     for tag, i1, i2, j1, j2 in opcodes:
-        o_start, o_end = old_char_range(i1, i2)
-        n_start, n_end = new_char_range(j1, j2)
+        o_start, o_end = old_tok_starts[i1], old_tok_starts[i2]
+        n_start, n_end = new_tok_starts[j1], new_tok_starts[j2]
 
         if tag == "equal":
             new_children.extend(emit_old_segment(o_start, o_end, include_text=True))
             continue
 
-        context_run = _context_run_for_pos(atoms, o_start)
+        context_run = _context_run_for_pos(atom_index, o_start)
         inserted = new_text[n_start:n_end]
 
         if tag in ("replace", "insert"):
-            new_children.extend(_emit_changed_text(inserted, context_run, markup=markup))
+            new_children.extend(
+                _emit_changed_text(inserted, context_run, markup=markup, templates=templates)
+            )
 
         # Preserve anchored elements that were in the replaced/deleted old range (not its old text).
         if tag in ("replace", "delete"):
             new_children.extend(emit_old_segment(o_start, o_end, include_text=False))
+    if suf:
+        new_children.extend(emit_old_segment(old_end, len(old_text), include_text=True))
 
     _rewrite_paragraph_in_place(p, new_children)
     return True
 
 
 def _iter_body_paragraphs(doc_root: etree._Element) -> List[etree._Element]:
-    return doc_root.xpath("/w:document/w:body//w:p", namespaces=NS)
+    return _XP_BODY_PARAS(doc_root)
 
 
 def _load_docx_xml(path: Path, part: str) -> etree._Element:
@@ -391,6 +582,29 @@ def _load_docx_xml(path: Path, part: str) -> etree._Element:
     return etree.fromstring(data)
 
 
+def _iter_paragraph_texts_streaming(path: Path, part: str) -> Iterator[str]:
+    # Yield each paragraph's text without keeping the parsed tree around.
+    # Paragraphs nested in text boxes end before their outer paragraph, so
+    # texts are buffered in document order until the outermost one closes.
+    with zipfile.ZipFile(path, "r") as zf:
+        with zf.open(part) as f:
+            pending: List[str] = []
+            open_slots: List[int] = []
+            for event, el in etree.iterparse(f, events=("start", "end"), tag=_T_P):
+                if event == "start":
+                    open_slots.append(len(pending))
+                    pending.append("")
+                    continue
+                pending[open_slots.pop()] = _paragraph_text_all_runs(el)
+                if open_slots:
+                    continue
+                yield from pending
+                pending.clear()
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+
+
 def _write_docx_with_replaced_part(original_path: Path, out_path: Path, part: str, xml_root: etree._Element) -> None:
     xml_bytes = etree.tostring(
         xml_root,
@@ -401,40 +615,96 @@ def _write_docx_with_replaced_part(original_path: Path, out_path: Path, part: st
     with zipfile.ZipFile(original_path, "r") as zin:
         with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
             for info in zin.infolist():
-                data = zin.read(info.filename)
                 if info.filename == part:
-                    data = xml_bytes
-                zout.writestr(info, data)
+                    zout.writestr(info, xml_bytes, compresslevel=1)
+                    continue
+                # Stream the other parts (media can be large) instead of
+                # holding each one fully in memory.
+                with zin.open(info) as src, zout.open(info, "w") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def _refine_paragraph(p: etree._Element, new_text: str, *, markup: bool) -> Tuple[bool, bool]:
+    # Returns (changed, skipped).
+    if _paragraph_is_simple(p):
+        return _apply_diff_to_paragraph(p, new_text, markup=markup), False
+    # Complex paragraphs (e.g., with hyperlinks/fields): use full-text
+    # replacement with local-style inheritance and additive markup.
+    if _apply_full_replace_to_paragraph(p, new_text, markup=markup):
+        return True, False
+    return False, True
+
+
+def _refine_paragraph_xml(job: Tuple[bytes, str, bool]) -> Tuple[Optional[bytes], bool]:
+    # Worker-process entry point: paragraphs travel as serialized XML.
+    p_xml, new_text, markup = job
+    p = etree.fromstring(p_xml)
+    changed, skipped = _refine_paragraph(p, new_text, markup=markup)
+    return (etree.tostring(p, with_tail=False) if changed else None), skipped
+
+
+def _refine_paragraphs(paras: List[etree._Element], new_texts: List[str], *, markup: bool, jobs: int = 1) -> Tuple[int, int]:
+    changed = 0
+    skipped = 0
+    if jobs <= 1:
+        for p, new_text in zip(paras, new_texts):
+            p_changed, p_skipped = _refine_paragraph(p, new_text, markup=markup)
+            changed += p_changed
+            skipped += p_skipped
+        return changed, skipped
+
+    # Unchanged paragraphs are settled here so they are never serialized.
+    # Nested paragraphs (text boxes and the paragraphs holding them) are diffed
+    # in-process, in document order: a worker's copy of the outer paragraph
+    # would detach the inner one and its own rewrite would be lost.
+    pending: List[Tuple[etree._Element, str]] = []
+    for p, new_text in zip(paras, new_texts):
+        if _paragraph_is_simple(p):
+            if _paragraph_text(p) == new_text:
+                continue
+        elif _paragraph_text_all_runs(p) == new_text:
+            skipped += 1
+            continue
+        if next(p.iterancestors(_T_P), None) is not None or next(p.iterdescendants(_T_P), None) is not None:
+            p_changed, p_skipped = _refine_paragraph(p, new_text, markup=markup)
+            changed += p_changed
+            skipped += p_skipped
+            continue
+        pending.append((p, new_text))
+
+    # Paragraphs are independent, so diff them across worker processes and
+    # splice the rewritten ones back in document order.
+    payloads = [(etree.tostring(p, with_tail=False), new_text, markup) for p, new_text in pending]
+    chunksize = max(1, len(payloads) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(_refine_paragraph_xml, payloads, chunksize=chunksize))
+    for (p, _), (new_xml, p_skipped) in zip(pending, results):
+        if new_xml is not None:
+            new_p = etree.fromstring(new_xml)
+            # Keep the whitespace between paragraphs, which is not sent to workers.
+            new_p.tail = p.tail
+            p.getparent().replace(p, new_p)
+            changed += 1
+        skipped += p_skipped
+    return changed, skipped
 
 
-def refine_from_amended(original_docx: Path, amended_docx: Path, out_docx: Path, *, markup: bool = True) -> Tuple[int, int]:
+def refine_from_amended(
+    original_docx: Path, amended_docx: Path, out_docx: Path, *, markup: bool = True, jobs: int = 1
+) -> Tuple[int, int]:
     part = "word/document.xml"
     orig_root = _load_docx_xml(original_docx, part)
-    amend_root = _load_docx_xml(amended_docx, part)
-
     orig_paras = _iter_body_paragraphs(orig_root)
-    amend_paras = _iter_body_paragraphs(amend_root)
+    # Only the amended text is needed, so that side is streamed, not loaded.
+    amend_texts = list(_iter_paragraph_texts_streaming(amended_docx, part))
 
-    if len(orig_paras) != len(amend_paras):
+    if len(orig_paras) != len(amend_texts):
         raise ValueError(
-            f"Paragraph count mismatch: original has {len(orig_paras)}, amended has {len(amend_paras)}. "
+            f"Paragraph count mismatch: original has {len(orig_paras)}, amended has {len(amend_texts)}. "
             "Export the amended DOCX so it preserves paragraph breaks, or extend the script to allow structural edits."
         )
 
-    changed = 0
-    skipped = 0
-    for p_orig, p_amend in zip(orig_paras, amend_paras):
-        new_text = _paragraph_text_all_runs(p_amend)
-        if _paragraph_is_simple(p_orig):
-            if _apply_diff_to_paragraph(p_orig, new_text, markup=markup):
-                changed += 1
-        else:
-            # Complex paragraphs (e.g., with hyperlinks/fields): use full-text
-            # replacement with local-style inheritance and additive markup.
-            if _apply_full_replace_to_paragraph(p_orig, new_text, markup=markup):
-                changed += 1
-            else:
-                skipped += 1
+    changed, skipped = _refine_paragraphs(orig_paras, amend_texts, markup=markup, jobs=jobs)
 
     _write_docx_with_replaced_part(original_docx, out_docx, part, orig_root)
     return changed, skipped
@@ -449,7 +719,7 @@ def _split_amended_text_to_paragraphs(text: str) -> List[str]:
 
 
 def refine_from_amended_text(
-    original_docx: Path, amended_text_path: Path, out_docx: Path, *, markup: bool = True
+    original_docx: Path, amended_text_path: Path, out_docx: Path, *, markup: bool = True, jobs: int = 1
 ) -> Tuple[int, int]:
     part = "word/document.xml"
     orig_root = _load_docx_xml(original_docx, part)
@@ -464,17 +734,7 @@ def refine_from_amended_text(
             "Ensure the amended text preserves paragraph breaks using blank lines between paragraphs."
         )
 
-    changed = 0
-    skipped = 0
-    for p_orig, new_text in zip(orig_paras, amended_paras):
-        if _paragraph_is_simple(p_orig):
-            if _apply_diff_to_paragraph(p_orig, new_text, markup=markup):
-                changed += 1
-        else:
-            if _apply_full_replace_to_paragraph(p_orig, new_text, markup=markup):
-                changed += 1
-            else:
-                skipped += 1
+    changed, skipped = _refine_paragraphs(orig_paras, amended_paras, markup=markup, jobs=jobs)
 
     _write_docx_with_replaced_part(original_docx, out_docx, part, orig_root)
     return changed, skipped
@@ -502,16 +762,26 @@ def main(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Do not apply bold/yellow highlighting to changed text (keeps inserted text in the surrounding style).",
     )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to diff paragraphs (default: 1, no worker processes).",
+    )
     args = ap.parse_args(argv)
+    if args.jobs < 1:
+        ap.error("--jobs must be at least 1")
 
     if args.out is None:
         args.out = args.original.with_name(args.original.stem + "_refined.docx")
 
     markup = not args.no_markup
     if args.amended is not None:
-        changed, skipped = refine_from_amended(args.original, args.amended, args.out, markup=markup)
+        changed, skipped = refine_from_amended(args.original, args.amended, args.out, markup=markup, jobs=args.jobs)
     else:
-        changed, skipped = refine_from_amended_text(args.original, args.amended_txt, args.out, markup=markup)
+        changed, skipped = refine_from_amended_text(
+            args.original, args.amended_txt, args.out, markup=markup, jobs=args.jobs
+        )
     print(f"Wrote: {args.out}")
     print(f"Paragraphs updated: {changed}")
     if skipped:
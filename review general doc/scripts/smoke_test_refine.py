@@ -12,7 +12,9 @@ try:
 except Exception as e:  # pragma: no cover
     raise SystemExit(f"python-docx is required for this smoke test: {e}")
 
-from refine_docx_from_amended import NS, w_tag, refine_from_amended
+from refine_docx_from_amended import NS, _lcs_opcodes, w_tag, refine_from_amended
+
+VML_NS = "urn:schemas-microsoft-com:vml"
 
 
 def _read_part(docx_path: Path, part: str) -> etree._Element:
@@ -20,7 +22,97 @@ def _read_part(docx_path: Path, part: str) -> etree._Element:
         return etree.fromstring(zf.read(part))
 
 
+def _check_lcs_opcodes() -> None:
+    # The rapidfuzz-free diff path; _token_opcodes only uses it without rapidfuzz.
+    cases = [
+        ([], [], 0),
+        ([], ["a", " ", "b"], 0),
+        (["a", " ", "b"], [], 0),
+        (["a", " ", "c"], ["a", " ", "b", " ", "c"], 3),
+        (["a", " ", "b", " ", "c"], ["a", " ", "c"], 3),
+        (["x", " ", "a", " ", "b"], ["a", " ", "b", " ", "y"], 3),
+        (["a", "b", "a", "b"], ["b", "a", "b", "a"], 3),
+    ]
+    for a, b, lcs_len in cases:
+        opcodes = _lcs_opcodes(a, b)
+        i = j = matched = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            assert (i1, j1) == (i, j), f"Opcodes not contiguous for {a} -> {b}: {opcodes}"
+            if tag == "equal":
+                assert a[i1:i2] == b[j1:j2], f"Bad equal span for {a} -> {b}: {opcodes}"
+                matched += i2 - i1
+            i, j = i2, j2
+        assert (i, j) == (len(a), len(b)), f"Opcodes do not cover {a} -> {b}: {opcodes}"
+        assert matched == lcs_len, f"Expected LCS {lcs_len} for {a} -> {b}, got {matched}"
+
+
+def _add_text_box(doc, text: str) -> None:
+    # python-docx has no text-box API, so nest a VML txbxContent paragraph by hand.
+    p = doc.add_paragraph()
+    p.add_run("Before the box ")
+    r = p.add_run()._r
+    pict = etree.SubElement(r, w_tag("pict"))
+    shape = etree.SubElement(pict, f"{{{VML_NS}}}shape")
+    textbox = etree.SubElement(shape, f"{{{VML_NS}}}textbox")
+    content = etree.SubElement(textbox, w_tag("txbxContent"))
+    inner = etree.SubElement(content, w_tag("p"))
+    etree.SubElement(etree.SubElement(inner, w_tag("r")), w_tag("t")).text = text
+
+
+def _pretty_print_document(src: Path, dst: Path) -> None:
+    with zipfile.ZipFile(src, "r") as zin, zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info)
+            if info.filename == "word/document.xml":
+                data = etree.tostring(etree.fromstring(data), pretty_print=True, xml_declaration=True, encoding="UTF-8")
+            zout.writestr(info, data)
+
+
+def _check_jobs_match_single_process(td_path: Path) -> None:
+    original = td_path / "boxed.docx"
+    amended = td_path / "boxed_amended.docx"
+
+    for path, box_text, body_text in (
+        (original, "inside the box", "The claim was dismissed."),
+        (amended, "inside the text box", "The claim was struck out."),
+    ):
+        doc = Document()
+        doc.add_paragraph("Unchanged opening paragraph.")
+        _add_text_box(doc, box_text)
+        doc.add_paragraph(body_text)
+        doc.save(path)
+
+    # Word writes document.xml without whitespace between elements, but other
+    # producers pretty-print it; both layouts must come out the same.
+    pretty = td_path / "boxed_pretty.docx"
+    _pretty_print_document(original, pretty)
+
+    for source in (original, pretty):
+        single = td_path / f"{source.stem}_jobs1.docx"
+        multi = td_path / f"{source.stem}_jobs2.docx"
+        counts1 = refine_from_amended(source, amended, single, jobs=1)
+        counts2 = refine_from_amended(source, amended, multi, jobs=2)
+        assert counts1 == counts2, f"--jobs 2 reported {counts2}, --jobs 1 reported {counts1}"
+
+        with zipfile.ZipFile(single, "r") as z1, zipfile.ZipFile(multi, "r") as z2:
+            xml1 = z1.read("word/document.xml")
+            xml2 = z2.read("word/document.xml")
+        assert xml1 == xml2, f"--jobs 2 output differs from --jobs 1 for {source.name}"
+
+    # The text-box edit lands in the box only; the paragraph holding the box
+    # keeps its own text.
+    root = etree.fromstring(xml1)
+    box_text = "".join(root.xpath("//w:txbxContent//w:t/text()", namespaces=NS))
+    assert box_text == "inside the text box", f"Text-box edit was lost, got: {box_text!r}"
+    outer = root.xpath("//w:body/w:p[.//w:txbxContent]", namespaces=NS)[0]
+    outer_text = "".join(outer.xpath("./w:r/w:t/text()", namespaces=NS))
+    assert outer_text == "Before the box ", f"Outer paragraph was rewritten, got: {outer_text!r}"
+    assert counts1 == (2, 0), f"Expected the box and last paragraph changed, got: {counts1}"
+
+
 def main() -> int:
+    _check_lcs_opcodes()
+
     with tempfile.TemporaryDirectory() as td:
         td_path = Path(td)
         original = td_path / "original.docx"
@@ -72,6 +164,8 @@ def main() -> int:
         xml = etree.tostring(root, encoding="unicode")
         assert "Times New Roman" in xml, "Expected original font to remain present in document.xml"
 
+        _check_jobs_match_single_process(td_path)
+
     print("OK")
     return 0
 
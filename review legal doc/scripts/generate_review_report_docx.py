@@ -3,38 +3,183 @@
 Generate a DOCX review report from plain text or markdown-like input.
 
 This script is intentionally lightweight so agents can always emit a report
-artifact (`.docx`) as a mandatory deliverable.
+artifact (`.docx`) as a mandatory deliverable. The package is written directly
+with lxml + zipfile from a small built-in template (styles, list numbering and
+settings, Calibri 12pt) rather than through python-docx's object model.
 """
 
 from __future__ import annotations
 
 import argparse
 import re
+import zipfile
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
-from docx import Document
-from docx.oxml.ns import qn
-from docx.shared import Pt
+from lxml import etree
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+
+def w_tag(local: str) -> str:
+    return f"{{{W_NS}}}{local}"
+
+
+_T_P = w_tag("p")
+_T_PPR = w_tag("pPr")
+_T_PSTYLE = w_tag("pStyle")
+_T_R = w_tag("r")
+_T_T = w_tag("t")
+_T_TAB = w_tag("tab")
+_T_VAL = w_tag("val")
+_XML_SPACE = f"{{{XML_NS}}}space"
+
+# Minimal package template. Styles mirror python-docx's default template for
+# the styles used here, with the report typography (Calibri, 12pt) pinned at
+# the style level; list numbering matches its List Bullet/List Number lists.
+_CONTENT_TYPES = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+<Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>
+<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
+</Types>"""
+
+_ROOT_RELS = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
+</Relationships>"""
+
+_DOCUMENT_RELS = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
+<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>"""
+
+# Without compatibilityMode, Word opens the report in Compatibility Mode; these
+# are the compat settings from python-docx's default template.
+_SETTINGS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="{W_NS}">
+<w:zoom w:val="bestFit"/>
+<w:defaultTabStop w:val="720"/>
+<w:characterSpacingControl w:val="doNotCompress"/>
+<w:compat>
+<w:useFELayout/>
+<w:compatSetting w:name="compatibilityMode" w:uri="http://schemas.microsoft.com/office/word" w:val="14"/>
+<w:compatSetting w:name="overrideTableStyleFontSizeAndJustification" w:uri="http://schemas.microsoft.com/office/word" w:val="1"/>
+<w:compatSetting w:name="enableOpenTypeFeatures" w:uri="http://schemas.microsoft.com/office/word" w:val="1"/>
+<w:compatSetting w:name="doNotFlipMirrorIndents" w:uri="http://schemas.microsoft.com/office/word" w:val="1"/>
+</w:compat>
+<w:decimalSymbol w:val="."/>
+<w:listSeparator w:val=","/>
+</w:settings>""".encode("utf-8")
+
+_CALIBRI = '<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri" w:eastAsia="Calibri"/>'
+_SIZE_12 = '<w:sz w:val="24"/><w:szCs w:val="24"/>'
+_CALIBRI_12 = _CALIBRI + _SIZE_12
+
+
+def _heading_style(level: int, before: int, color: str) -> str:
+    return (
+        f'<w:style w:type="paragraph" w:styleId="Heading{level}"><w:name w:val="heading {level}"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:uiPriority w:val="9"/><w:qFormat/>'
+        f'<w:pPr><w:keepNext/><w:keepLines/><w:spacing w:before="{before}" w:after="0"/>'
+        f'<w:outlineLvl w:val="{level - 1}"/></w:pPr>'
+        f'<w:rPr>{_CALIBRI}<w:b/><w:bCs/><w:color w:val="{color}"/>{_SIZE_12}</w:rPr></w:style>'
+    )
+
+
+def _list_style(style_id: str, name: str, num_id: int) -> str:
+    return (
+        f'<w:style w:type="paragraph" w:styleId="{style_id}"><w:name w:val="{name}"/>'
+        '<w:basedOn w:val="Normal"/><w:uiPriority w:val="99"/>'
+        f'<w:pPr><w:numPr><w:numId w:val="{num_id}"/></w:numPr><w:contextualSpacing/></w:pPr>'
+        f"<w:rPr>{_CALIBRI_12}</w:rPr></w:style>"
+    )
+
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:styles xmlns:w="{W_NS}">'
+    "<w:docDefaults><w:rPrDefault><w:rPr>"
+    f'{_CALIBRI_12}<w:lang w:val="en-US" w:eastAsia="en-US" w:bidi="ar-SA"/>'
+    "</w:rPr></w:rPrDefault><w:pPrDefault><w:pPr>"
+    '<w:spacing w:after="200" w:line="276" w:lineRule="auto"/>'
+    "</w:pPr></w:pPrDefault></w:docDefaults>"
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/>'
+    f"<w:rPr>{_CALIBRI_12}</w:rPr></w:style>"
+    + _heading_style(1, 480, "365F91")
+    + _heading_style(2, 200, "4F81BD")
+    + _heading_style(3, 200, "4F81BD")
+    + _list_style("ListBullet", "List Bullet", 1)
+    + _list_style("ListNumber", "List Number", 2)
+    + "</w:styles>"
+).encode("utf-8")
+
+
+def _single_level_list(abstract_id: int, fmt: str, text: str, style_id: str, rPr: str = "") -> str:
+    return (
+        f'<w:abstractNum w:abstractNumId="{abstract_id}"><w:multiLevelType w:val="singleLevel"/>'
+        f'<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="{fmt}"/><w:pStyle w:val="{style_id}"/>'
+        f'<w:lvlText w:val="{text}"/><w:lvlJc w:val="left"/>'
+        '<w:pPr><w:tabs><w:tab w:val="num" w:pos="360"/></w:tabs><w:ind w:left="360" w:hanging="360"/></w:pPr>'
+        f"{rPr}</w:lvl></w:abstractNum>"
+    )
+
+
+_NUMBERING = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<w:numbering xmlns:w="{W_NS}">'
+    + _single_level_list(
+        0, "bullet", "&#61623;", "ListBullet", '<w:rPr><w:rFonts w:ascii="Symbol" w:hAnsi="Symbol" w:hint="default"/></w:rPr>'
+    )
+    + _single_level_list(1, "decimal", "%1.", "ListNumber")
+    + '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    + '<w:num w:numId="2"><w:abstractNumId w:val="1"/></w:num>'
+    + "</w:numbering>"
+).encode("utf-8")
+
+# US Letter with python-docx's default margins.
+_SECT_PR = (
+    f'<w:sectPr xmlns:w="{W_NS}"><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" w:header="720" w:footer="720" w:gutter="0"/>'
+    '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/></w:sectPr>'
+)
+
+
+_RE_BACKTICK = re.compile(r"`([^`]*)`")
+_RE_BOLD = re.compile(r"\*\*([^*]+)\*\*")
+_RE_ITAL = re.compile(r"\*([^*]+)\*")
+_RE_NUMPREF = re.compile(r"^\s*\d+\.\s+")
+_RE_BRACKET_DOT = re.compile(r"^\[\d+\]\.\s+")
+_RE_BRACKET_SP = re.compile(r"^\[\d+\]\s+")
+_RE_FOOTNOTE = re.compile(r"^Footnote\s+\d+\b", re.IGNORECASE)
+_NUMBERED_RE = re.compile(r"\d+\. ")
 
 
 def _is_numbered(line: str) -> bool:
-    i = 0
-    while i < len(line) and line[i].isdigit():
-        i += 1
-    return i > 0 and i + 1 < len(line) and line[i] == "." and line[i + 1] == " "
+    return _NUMBERED_RE.match(line) is not None
 
 
 def _strip_markdown_inline(text: str) -> str:
     # Remove common markdown wrappers while preserving readable plain text.
-    text = re.sub(r"`([^`]*)`", r"\1", text)
-    text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)
-    text = re.sub(r"\*([^*]+)\*", r"\1", text)
+    text = _RE_BACKTICK.sub(r"\1", text)
+    text = _RE_BOLD.sub(r"\1", text)
+    text = _RE_ITAL.sub(r"\1", text)
     return text
 
 
 def _strip_numeric_prefix(text: str) -> str:
     # "12. Something" -> "Something"
-    return re.sub(r"^\s*\d+\.\s+", "", text)
+    return _RE_NUMPREF.sub("", text)
 
 
 def _normalize_ledger_item(text: str) -> str:
@@ -48,20 +193,67 @@ def _normalize_ledger_item(text: str) -> str:
     t = _strip_numeric_prefix(t)
     t = t.strip()
 
-    # If line starts like "[12]. ..." preserve exactly.
-    if re.match(r"^\[\d+\]\.\s+", t):
-        return t
-    # If line starts like "[12] ..." preserve exactly.
-    if re.match(r"^\[\d+\]\s+", t):
-        return t
-    # If line starts like "Footnote 12..." preserve.
-    if re.match(r"^Footnote\s+\d+\b", t, flags=re.IGNORECASE):
-        return t
+    # Label forms differ in their first character, so dispatch on it and try
+    # at most the patterns that can match.
+    c = t[:1]
+    if c == "[":
+        # If line starts like "[12]. ..." or "[12] ..." preserve exactly.
+        if _RE_BRACKET_DOT.match(t) or _RE_BRACKET_SP.match(t):
+            return t
+    elif c in ("F", "f"):
+        # If line starts like "Footnote 12..." preserve.
+        if _RE_FOOTNOTE.match(t):
+            return t
     return t
 
 
+def _add_paragraph(body: etree._Element, text: str, style: Optional[str] = None) -> None:
+    p = etree.SubElement(body, _T_P)
+    if style is not None:
+        pPr = etree.SubElement(p, _T_PPR)
+        etree.SubElement(pPr, _T_PSTYLE).set(_T_VAL, style)
+    if not text:
+        return
+    r = etree.SubElement(p, _T_R)
+    for i, chunk in enumerate(text.split("\t")):
+        if i:
+            etree.SubElement(r, _T_TAB)
+        if chunk:
+            t = etree.SubElement(r, _T_T)
+            if chunk != chunk.strip():
+                t.set(_XML_SPACE, "preserve")
+            t.text = chunk
+
+
+def _core_properties() -> bytes:
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" \
+xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" \
+xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+<dc:title/>
+<cp:revision>1</cp:revision>
+<dcterms:created xsi:type="dcterms:W3CDTF">{now}</dcterms:created>
+<dcterms:modified xsi:type="dcterms:W3CDTF">{now}</dcterms:modified>
+</cp:coreProperties>""".encode("utf-8")
+
+
+def _write_package(document: etree._Element, out_path: Path) -> None:
+    document_xml = etree.tostring(document, encoding="UTF-8", xml_declaration=True, standalone=True)
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+        zf.writestr("word/document.xml", document_xml)
+        zf.writestr("word/styles.xml", _STYLES)
+        zf.writestr("word/numbering.xml", _NUMBERING)
+        zf.writestr("word/settings.xml", _SETTINGS)
+        zf.writestr("docProps/core.xml", _core_properties())
+
+
 def build_docx(input_text: str, out_path: Path) -> None:
-    doc = Document()
+    document = etree.Element(w_tag("document"), nsmap={"w": W_NS})
+    body = etree.SubElement(document, w_tag("body"))
     in_ledger = False
 
     for raw in input_text.splitlines():
@@ -69,59 +261,35 @@ def build_docx(input_text: str, out_path: Path) -> None:
         stripped = line.strip()
 
         if not stripped:
-            doc.add_paragraph("")
+            _add_paragraph(body, "")
             continue
 
         if stripped.startswith("# "):
-            doc.add_heading(stripped[2:].strip(), level=1)
+            _add_paragraph(body, stripped[2:].strip(), "Heading1")
             continue
         if stripped.startswith("## "):
             heading = _strip_markdown_inline(stripped[3:].strip())
-            doc.add_heading(heading, level=2)
+            _add_paragraph(body, heading, "Heading2")
             in_ledger = "verification ledger" in heading.lower()
             continue
         if stripped.startswith("### "):
             heading = _strip_markdown_inline(stripped[4:].strip())
-            doc.add_heading(heading, level=3)
+            _add_paragraph(body, heading, "Heading3")
             in_ledger = "verification ledger" in heading.lower()
             continue
         if stripped.startswith("- "):
-            doc.add_paragraph(_strip_markdown_inline(stripped[2:].strip()), style="List Bullet")
+            _add_paragraph(body, _strip_markdown_inline(stripped[2:].strip()), "ListBullet")
             continue
         if _is_numbered(stripped):
             item = _strip_numeric_prefix(stripped)
             item = _normalize_ledger_item(item) if in_ledger else _strip_markdown_inline(item)
-            doc.add_paragraph(item, style="List Number")
+            _add_paragraph(body, item, "ListNumber")
             continue
 
-        doc.add_paragraph(_strip_markdown_inline(line))
-
-    # Enforce report typography: Calibri, 12pt throughout.
-    for style_name in (
-        "Normal",
-        "Heading 1",
-        "Heading 2",
-        "Heading 3",
-        "List Bullet",
-        "List Number",
-    ):
-        try:
-            doc.styles[style_name].font.name = "Calibri"
-            doc.styles[style_name].font.size = Pt(12)
-        except KeyError:
-            pass
-
-    for para in doc.paragraphs:
-        for run in para.runs:
-            run.font.name = "Calibri"
-            run.font.size = Pt(12)
-            if run._element.rPr is not None:
-                run._element.rPr.rFonts.set(qn("w:ascii"), "Calibri")
-                run._element.rPr.rFonts.set(qn("w:hAnsi"), "Calibri")
-                run._element.rPr.rFonts.set(qn("w:cs"), "Calibri")
-                run._element.rPr.rFonts.set(qn("w:eastAsia"), "Calibri")
-
-    doc.save(out_path)
+        _add_paragraph(body, _strip_markdown_inline(line))
+
+    body.append(etree.fromstring(_SECT_PR))
+    _write_package(document, out_path)
 
 
 def parse_args() -> argparse.Namespace:
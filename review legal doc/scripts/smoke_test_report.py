@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import tempfile
+import zipfile
+from pathlib import Path
+
+from lxml import etree
+
+try:
+    from docx import Document
+except Exception as e:  # pragma: no cover
+    raise SystemExit(f"python-docx is required for this smoke test: {e}")
+
+from generate_review_report_docx import W_NS, build_docx
+
+REPORT = """# Review Report
+## Summary
+The draft is **mostly** sound.
+- Fix the `citation` format
+1. First change
+## Verification Ledger
+2. [12]. Smith v Jones
+3. Footnote 4: checked
+Total\tpages
+"""
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        out = Path(td) / "report.docx"
+        build_docx(REPORT, out)
+
+        doc = Document(out)
+        got = [(p.style.name, p.text) for p in doc.paragraphs]
+        expected = [
+            ("Heading 1", "Review Report"),
+            ("Heading 2", "Summary"),
+            ("Normal", "The draft is mostly sound."),
+            ("List Bullet", "Fix the citation format"),
+            ("List Number", "First change"),
+            ("Heading 2", "Verification Ledger"),
+            ("List Number", "[12]. Smith v Jones"),
+            ("List Number", "Footnote 4: checked"),
+            ("Normal", "Total\tpages"),
+        ]
+        assert got == expected, f"Unexpected report paragraphs: {got}"
+
+        # python-docx fills in defaults for missing parts, so read the package itself.
+        with zipfile.ZipFile(out, "r") as zf:
+            names = set(zf.namelist())
+            assert "docProps/core.xml" in names, "Expected docProps/core.xml in the package"
+            settings = etree.fromstring(zf.read("word/settings.xml"))
+        compat = settings.xpath("w:compat/w:compatSetting[@w:name='compatibilityMode']/@w:val", namespaces={"w": W_NS})
+        assert compat == ["14"], f"Expected compatibilityMode 14, got: {compat}"
+
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())